@@ -1,9 +1,18 @@
+import os
 import re
+import sys
 import argparse
+import asyncio
+import codecs
+from http.cookies import CookieError, SimpleCookie
+from functools import lru_cache
 from pathlib import Path
-from urllib.parse import urljoin
+from urllib.parse import urlencode
+import httpx
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from selectolax.lexbor import LexborHTMLParser
 from tqdm import tqdm
 
 DEFAULT_LIST_URL = "https://www.ebsi.co.kr/ebs/xip/xipc/previousPaperListAjax.ajax"
@@ -29,40 +38,69 @@ TARGET_MAP = {
 
 GRADE_NAME = {1: "고1", 2: "고2", 3: "고3"}
 
+# 동시에 다운로드하는 작업자(consumer) 수 — 파일 단위
+DOWNLOAD_CONCURRENCY = 8
+# 목록 조회와 다운로드 사이에 쌓아둘 수 있는 파일 수
+QUEUE_SIZE = 64
+
+# ---------- 정규식 (모듈 로드 시 한 번만 컴파일) ----------
+_YEAR_RE = re.compile(r'(\d{4})\s*년')
+_MONTH_RE = re.compile(r'(\d{1,2})\s*월')
+_MONTH_HELD_RE = re.compile(r'(\d{1,2})\.\s*\d{1,2}\s*시행')
+_MONTH_DOT_RE = re.compile(r'(\d{1,2})\.\s*\d{1,2}')
+_LEVEL_RE = re.compile(r'([1-4])$')
+_EXT_RE = re.compile(r"\.([A-Za-z0-9]{1,5})(?:\?|#|$)")
+_ONCLICK_ARG_RE = re.compile(r"\(\s*(['\"])(.+?)\1\s*,")  # extract_first_arg의 예비 경로
+
+# 파일명에 쓸 수 없는 문자 → 공백 (정규식 대신 str.translate 한 번)
+_SANITIZE_TABLE = str.maketrans(dict.fromkeys('\\/:*?"<>|', " "))
+
+# ---------- 목록 파싱용 선택자 ----------
+_PROB_ONCLICK = "goDownLoadP("  # 문제 다운로드 버튼의 onclick 접두어
+_SOL_ONCLICK = "goDownLoadH("   # 해설 다운로드 버튼의 onclick 접두어
+_CONTAINER_SEL = "div.board_qusesion"
+_PROB_BTN_SEL = f'li button[onclick^="{_PROB_ONCLICK}"]'
+_SOL_BTN_SEL = f'button[onclick^="{_SOL_ONCLICK}"]'
+
 # ---------- 유틸 ----------
+# 이름 관련 함수는 모두 순수 함수: 같은 제목/과목이 페이지마다 반복되므로 결과를 캐시한다
+@lru_cache(maxsize=4096)
 def sanitize_filename(name: str) -> str:
-    name = re.sub(r'[\\/:*?"<>|]', " ", name)
-    name = re.sub(r'\s+', " ", name).strip()
-    return name
+    # 인자 없는 split()이 연속 공백을 한 번에 정리하고 앞뒤 공백도 떼어 준다
+    return " ".join(name.translate(_SANITIZE_TABLE).split())
 
+@lru_cache(maxsize=4096)
 def extract_year(title: str) -> str:
-    m = re.search(r'(\d{4})\s*년', title)
+    m = _YEAR_RE.search(title)
     return m.group(1) if m else "기타"
 
+@lru_cache(maxsize=4096)
 def extract_month(title: str) -> str:
-    m = re.search(r'(\d{1,2})\s*월', title)
+    m = _MONTH_RE.search(title)
     if m:
         return f"{int(m.group(1)):02d}"
-    m = re.search(r'(\d{1,2})\.\s*\d{1,2}\s*시행', title)
+    m = _MONTH_HELD_RE.search(title)
     if m:
         return f"{int(m.group(1)):02d}"
-    m = re.search(r'(\d{1,2})\.\s*\d{1,2}', title)
+    m = _MONTH_DOT_RE.search(title)
     if m:
         return f"{int(m.group(1)):02d}"
     return "00"
 
+@lru_cache(maxsize=4096)
 def extract_subject_raw(title: str) -> str:
     t = title.replace("\xa0", " ")
     parts = t.strip().split()
     return parts[-1] if parts else "과목"
 
+@lru_cache(maxsize=256)
 def normalize_subject(subj: str) -> str:
     s = (subj or "").replace(" ", "")
     roman_map = {"Ⅰ": "1", "Ⅱ": "2", "Ⅲ": "3", "Ⅳ": "4", "I": "1", "II": "2", "III": "3", "IV": "4"}
     for k, v in roman_map.items():
         s = s.replace(k, v)
 
-    m_level = re.search(r'([1-4])$', s)
+    m_level = _LEVEL_RE.search(s)
     level = m_level.group(1) if m_level else ""
 
     base = ""
@@ -79,84 +117,360 @@ def normalize_subject(subj: str) -> str:
 
     return f"{base}{level}" if level else base
 
-def build_abs_url(raw: str | None, base: str) -> str | None:
+def build_abs_url(raw: str | None, base_prefix: str) -> str | None:
+    # base_prefix는 호출 측에서 한 번만 만들어 둔 "…/" 로 끝나는 기준 경로
     if not raw:
         return None
     raw = raw.strip().strip("'").strip('"')
-    if raw.startswith("http://") or raw.startswith("https://"):
+    if raw.startswith(("http://", "https://")):
         return raw
-    return urljoin(base if base.endswith('/') else base + '/', raw.lstrip('/'))
+    return base_prefix + raw.lstrip('/')
 
 def ext_from_url(u: str | None, default: str = ".pdf") -> str:
     if not u:
         return default
-    m = re.search(r"\.([A-Za-z0-9]{1,5})(?:\?|#|$)", u)
+    m = _EXT_RE.search(u)
     return f".{m.group(1)}" if m else default
 
-def parse_list_items(html: str):
-    try:
-        soup = BeautifulSoup(html, "lxml")
-    except Exception:
-        soup = BeautifulSoup(html, "html.parser")
-    for tag in soup(["script", "style"]):
-        tag.decompose()
-
+def extract_first_arg(onclick: str) -> str | None:
+    # goDownLoadP('경로', ...)에서 첫 번째 따옴표 인자만 꺼낸다 (보통은 str.find 두 번으로 끝)
+    i = onclick.find("(")
+    if i >= 0:
+        rest = onclick[i + 1:].lstrip()
+        if rest and rest[0] in "'\"":
+            j = rest.find(rest[0], 1)
+            if j > 1:
+                return rest[1:j]
+    # 형식이 예상과 다를 때만 정규식으로 한 번 더 시도
+    m = _ONCLICK_ARG_RE.search(onclick)
+    return m.group(2) if m else None
+
+def parse_list_items(tree: LexborHTMLParser):
     items = []
-    container = soup.select_one("div.board_qusesion") or soup
-    problem_btns = container.select('li button[onclick^="goDownLoadP("]')
-
-    for pbtn in problem_btns:
-        li = pbtn.find_parent("li")
-        if not li:
+    container = tree.css_first(_CONTAINER_SEL) or tree.root
+    # 실제로 읽는 건 목록 컨테이너뿐이니 script/style 제거도 그 안에서만 (lexbor 호출 한 번)
+    container.strip_tags(["script", "style"], recursive=True)
+
+    for pbtn in container.css(_PROB_BTN_SEL):
+        li = pbtn.parent
+        while li is not None and li.tag != "li":
+            li = li.parent
+        if li is None:
             continue
 
-        title_tag = li.select_one(".tit") or li.find("p", class_="tit")
+        title_tag = li.css_first(".tit")
         if title_tag:
-            title = sanitize_filename(title_tag.get_text(separator=" ", strip=True))
+            # 제목은 어차피 공백을 정리하므로 lexbor의 C 구현 text()로 충분하다
+            title = sanitize_filename(title_tag.text(separator=" ", strip=True))
         else:
-            raw = li.get_text(separator=" ", strip=True)
-            title = sanitize_filename(raw.split("  ")[0] if raw else "제목미상")
+            # skip_empty: 빈 텍스트 조각을 건너뛰어야 "  "(두 칸 공백) 기준 자르기가 예전과 같다
+            raw = li.text(separator=" ", strip=True, skip_empty=True)
+            # lexbor의 strip은 ASCII 공백만 지워서 &nbsp;만 있는 행은 빈 제목이 될 수 있다
+            title = sanitize_filename(raw.split("  ")[0] if raw else "") or "제목미상"
 
-        on_p = pbtn.get("onclick", "")
-        m_p = re.search(r"\(\s*(['\"])(.+?)\1\s*,", on_p)
-        prob_path = m_p.group(2) if m_p else None
+        prob_path = extract_first_arg(pbtn.attributes.get("onclick") or "")
 
-        hbtn = li.select_one('button[onclick^="goDownLoadH("]')
-        sol_path = None
-        if hbtn:
-            on_h = hbtn.get("onclick", "")
-            m_h = re.search(r"\(\s*(['\"])(.+?)\1\s*,", on_h)
-            sol_path = m_h.group(2) if m_h else None
+        hbtn = li.css_first(_SOL_BTN_SEL)
+        sol_path = extract_first_arg(hbtn.attributes.get("onclick") or "") if hbtn else None
 
         if prob_path or sol_path:
             items.append((title, prob_path, sol_path))
 
     return items
 
-def download_file(session: requests.Session, url: str, out_path: Path, chunk=1024*64):
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    with session.get(url, stream=True, timeout=60) as r:
-        r.raise_for_status()
-        total = int(r.headers.get("Content-Length", 0))
-        with open(out_path, "wb") as f, tqdm(
-            total=total if total > 0 else None, unit="B", unit_scale=True, desc=out_path.name
-        ) as pbar:
-            for part in r.iter_content(chunk_size=chunk):
-                if part:
-                    f.write(part)
-                    if total:
-                        pbar.update(len(part))
+async def head_size(client: httpx.AsyncClient, url: str) -> int:
+    # HEAD로 파일 크기만 확인한다. 모르면 0 (오류는 여기서 삼키고 GET에서 다시 드러나게 둔다)
+    try:
+        r = await client.head(url)
+        if r.status_code != 200:
+            return 0
+        return int(r.headers.get("Content-Length", 0))
+    except (httpx.HTTPError, ValueError):
+        return 0
+
+def is_complete(path: Path, size: int) -> bool:
+    # 이전 실행에서 받아둔 파일인지: 서버 크기(HEAD)와 같으면 완성본, 서버 크기를 모르면 있는 것만 믿는다
+    try:
+        have = path.stat().st_size
+    except FileNotFoundError:
+        return False
+    return have > 0 and (not size or have == size)
+
+async def download_file_async(client: httpx.AsyncClient, url: str, out_path: Path, bar: tqdm,
+                              size: int = 0):
+    # 받는 중에는 .part에 쓰고 끝나면 이름을 바꾼다 → 최종 파일이 있으면 완성본
+    part_path = out_path.with_name(out_path.name + ".part")
+    # 이전에 받다 만 .part가 있으면 Range 요청으로 이어받는다.
+    # 크기가 서버 파일과 같아도 Range로 한 번 확인한다 (416 응답의 전체 크기로 판단)
+    start = part_path.stat().st_size if part_path.exists() else 0
+    if size and start > size:
+        start = 0  # 서버 파일보다 큰 .part는 믿을 수 없음 → 처음부터
+    while True:
+        headers = {"Range": f"bytes={start}-"} if start else None
+        async with client.stream("GET", url, headers=headers) as r:
+            if start and r.status_code == 416:
+                # 서버가 알려 준 전체 크기(Content-Range: bytes */N)가 .part와 같으면 이미 다 받은 것
+                # (마지막 쓰기 뒤 이름을 바꾸기 전에 끊긴 경우) → 다시 받지 않고 이름만 바꾼다
+                if r.headers.get("Content-Range", "") == f"bytes */{start}":
+                    break
+                # 그 밖엔 이어받을 구간이 없음(서버 파일이 바뀌었거나 .part가 이상함) → 처음부터 다시 받는다
+                start = 0
+                continue
+            r.raise_for_status()
+            if start and r.status_code != 206:
+                start = 0  # 서버가 Range를 무시하고 전체를 보냄 → 처음부터 다시 쓴다
+            total = int(r.headers.get("Content-Length", 0))
+            if total:
+                # 전체 진행바는 남은 바이트 기준: 응답 크기를 알게 될 때마다 합계에 더한다
+                bar.total = (bar.total or 0) + total
+                bar.refresh()
+            # 파일 쓰기는 동기로 둔다 (로컬 디스크에서는 aiofiles보다 빠름).
+            # 버퍼드 IO를 거치지 않고 fd에 바로 쓴다 (Windows는 O_BINARY 필수).
+            # 미리 공간을 잡아 두지(fallocate) 않는다: 강제 종료되면 .part 크기가 받은 양보다 커져서
+            # 이어받기 기준이 깨진다
+            fd = os.open(part_path, os.O_WRONLY | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644)
+            try:
+                os.ftruncate(fd, start)  # 이어받기 지점 뒤는 버린다 (새로 받을 땐 비움)
+                os.lseek(fd, start, os.SEEK_SET)
+                # chunk_size를 주면 httpx가 그만큼 모일 때까지 쥐고 있어서, 끊기면 .part에 남는 게 없다
+                # → 네트워크에서 읽힌 만큼 바로 쓴다
+                async for part in r.aiter_bytes():
+                    view = memoryview(part)
+                    while view:
+                        view = view[os.write(fd, view):]
+                    bar.update(len(part))
+            finally:
+                os.close(fd)
+        break
+    part_path.replace(out_path)
+
+async def download_item(client: httpx.AsyncClient, bar: tqdm, title: str,
+                        url: str, out_path: Path, size: int):
+    try:
+        await download_file_async(client, url, out_path, bar, size)
+        return True
+    except httpx.HTTPStatusError as e:
+        tqdm.write(f"HTTP 오류: {title} -> {e.response.status_code} {e.request.url}")
+    except Exception as e:
+        tqdm.write(f"다운로드 실패: {title} -> {e}")
+    return False
+
+def fetch_list_page(session: requests.Session, url: str, data: bytes,
+                    debug_path: Path | None = None) -> LexborHTMLParser:
+    r = session.post(url, data=data, timeout=60)
+    r.raise_for_status()
+    body = r.content
+    if debug_path:
+        debug_path.write_bytes(body)
+    # lexbor는 bytes를 UTF-8로 읽는다 → UTF-8 응답이면 str로 디코딩하지 않고 그대로 넘긴다
+    if r.encoding:
+        try:
+            is_utf8 = codecs.lookup(r.encoding).name == "utf-8"
+        except LookupError:
+            is_utf8 = False  # 파이썬이 모르는 charset(x-windows-949 등)
+        if not is_utf8:
+            # 그 밖의 인코딩은 requests의 r.text에 맡긴다 (모르는 charset도 errors="replace"로 읽어 줌)
+            return LexborHTMLParser(r.text)
+    return LexborHTMLParser(body)
+
+def _clean_cookie_value(v: str) -> str:
+    # 쿠키 값 앞뒤 공백과 따옴표 제거 (SimpleCookie로 읽었든 ";"로 잘랐든 같은 규칙)
+    return v.strip().strip('"').strip("'")
 
 def add_cookies_from_header(cookie_header: str, session: requests.Session):
     if not cookie_header:
         return
+    # 값 전체를 큰따옴표로 감싼 경우("a;b")는 SimpleCookie가 ";"를 값으로 제대로 읽는다
+    parsed = SimpleCookie()
+    try:
+        parsed.load(cookie_header)
+    except CookieError:
+        # 이름에 "/", "(" 같은 문자가 있으면 SimpleCookie는 예외를 낸다 → 전부 아래 방식으로 읽는다
+        parsed = SimpleCookie()
+    # morsel.value는 큰따옴표 안의 \073 같은 8진수 이스케이프를 풀어 버린다 (브라우저는 값을 그대로 보냄)
+    # → 적힌 그대로인 coded_value를 쓰고, 따옴표는 아래 ";" 방식과 똑같이 벗긴다
+    for k, morsel in parsed.items():
+        session.cookies.set(k, _clean_cookie_value(morsel.coded_value))
+
+    # 단, SimpleCookie는 규격에 안 맞는 값(공백, JSON 등)을 만나면 그 뒤를 통째로 버린다
+    # → 거기서 빠진 쿠키만 예전처럼 ";"로 잘라서 채운다
+    #   (그래서 b={"k":"v;w"}처럼 따옴표 없는 값 안의 ";"는 예전처럼 거기서 잘린다)
     for piece in [p.strip() for p in cookie_header.split(";") if p.strip()]:
         if "=" not in piece:
             continue
         k, v = piece.split("=", 1)
-        session.cookies.set(k.strip(), v.strip().strip('"').strip("'"))
+        k = k.strip()
+        if k not in parsed:
+            session.cookies.set(k, _clean_cookie_value(v))
 
 # ---------- 메인 ----------
+async def crawl(args, session: requests.Session, headers: dict):
+    out_root = Path(args.out)
+
+    target_cd = TARGET_MAP[args.grade]
+    grade_name = GRADE_NAME[args.grade]
+
+    # ✅ payload를 동적으로 구성 (subjList를 인자로부터)
+    payload_base = {
+        "beginYear": args.beginYear,
+        "endYear": args.endYear,
+        "targetCd": target_cd,
+        "monthList": args.monthList,
+        "subjList": str(args.category),  # ← 여기!
+        "sort": args.sort,
+        "pageSize": args.pageSize,
+    }
+
+    # 폼 본문은 currentPage만 바뀌므로 나머지는 한 번만 인코딩해 둔다
+    # (Content-Type은 세션 헤더에 이미 form-urlencoded로 설정되어 있음)
+    form_prefix = urlencode(payload_base).encode()
+
+    # 파일 경로를 붙일 기준 URL (항목마다 urljoin 하지 않도록 미리 정규화)
+    url_base = args.base.rstrip("/") + "/"
+
+    # 카테고리명(폴더명에 사용)
+    category_name = CATEGORY_MAP.get(args.category, f"카테고리{args.category}")
+    # 폴더명 앞부분은 실행 내내 같으니 한 번만 만든다
+    dir_prefix = f"기출문제_{grade_name}_{category_name}_"
+
+    # 파일 다운로드는 httpx(HTTP/2)로 동시에 진행 (목록 조회/파싱은 기존 requests 세션 그대로).
+    # HTTP/2면 wdown 서버와 연결 하나로 여러 파일을 동시에 받는다 (파일마다 TLS 핸드셰이크 없음)
+    limits = httpx.Limits(max_connections=16, max_keepalive_connections=8, keepalive_expiry=75)
+    timeout = httpx.Timeout(60.0, pool=None)  # 연결 풀 대기는 무제한 (작업자 수로 이미 제한됨)
+    cookies = {c.name: c.value for c in session.cookies}
+    # PDF는 압축해도 이득이 없다: 인코딩 없이 받으면 디코딩 단계를 건너뛰고,
+    # Content-Length가 파일 크기와 같아져서 Range 이어받기와도 맞아떨어진다
+    dl_headers = {**headers, "Accept-Encoding": "identity"}
+
+    # 목록 페이지 조회(producer)와 파일 다운로드(consumer)를 겹쳐서 진행 (큐에는 파일 단위로 넣음):
+    # 다운로드가 도는 동안 다음 페이지 목록을 미리 받아 큐에 채운다
+    queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+    seen: set = set()
+    made_dirs: set[Path] = set()  # 이미 만든 폴더 (파일마다 mkdir 하지 않도록)
+
+    def fetch_page(page: int) -> asyncio.Task:
+        data = form_prefix + b"&currentPage=" + str(page).encode()
+        debug_path = Path(f"debug_page_{page}.html") if args.debug else None
+        return asyncio.create_task(
+            asyncio.to_thread(fetch_list_page, session, args.list_url, data, debug_path))
+
+    async def producer(client: httpx.AsyncClient):
+        page = 1
+        next_page = fetch_page(page)
+        try:
+            while True:
+                tree = await next_page
+                next_page = None
+
+                if tree.css_first("li") is None:
+                    tqdm.write(f"페이지 {page}: 더 이상 항목 없음 → 종료")
+                    break
+
+                items = parse_list_items(tree)
+                if not items:
+                    tqdm.write(f"페이지 {page}: 항목 없음 → 종료")
+                    break
+
+                # 이 페이지의 HEAD/큐 적재를 하는 동안 다음 페이지 목록을 미리 받아 둔다
+                # (세션은 한 번에 한 요청만 쓰도록 다음 요청은 이전 응답을 받은 뒤에 시작)
+                next_page = fetch_page(page + 1)
+
+                tqdm.write(f"페이지 {page}: {len(items)}건 다운로드")
+
+                jobs = []
+                for title, prob_path, sol_path in items:
+                    year  = extract_year(title)
+                    month = extract_month(title)
+                    subj_raw = extract_subject_raw(title)
+                    subj_norm = normalize_subject(subj_raw)
+
+                    prob_url = build_abs_url(prob_path, url_base) if prob_path else None
+                    sol_url  = build_abs_url(sol_path,  url_base) if sol_path  else None
+
+                    prob_ext = ext_from_url(prob_url, ".pdf")
+                    sol_ext  = ext_from_url(sol_url,  ".pdf")
+
+                    # ✅ 폴더명 규칙: downloads/기출문제_고3_{카테고리명}_{세부과목}_{년도}
+                    # 예) 기출문제_고3_과학탐구_물리1_2021  /  기출문제_고3_영어_영어_2021
+                    target_dir = out_root / (dir_prefix + subj_norm + "_" + year)
+
+                    # 파일명 규칙: YYYY_MM_과목_문제 / YYYY_MM_과목_해설 (변경 없음)
+                    base_prefix = year + "_" + month + "_" + subj_norm
+                    prob_name = base_prefix + "_문제" + prob_ext
+                    sol_name  = base_prefix + "_해설" + sol_ext
+
+                    if target_dir not in made_dirs:
+                        target_dir.mkdir(parents=True, exist_ok=True)
+                        made_dirs.add(target_dir)
+
+                    for kind, url, out_path in (("문제", prob_url, target_dir / prob_name),
+                                                ("해설", sol_url, target_dir / sol_name)):
+                        if not url:
+                            tqdm.write(f"※ {kind} URL 없음: {title}")
+                            continue
+                        # 같은 URL(또는 같은 저장 경로)은 한 번만 받는다
+                        # (경로까지 보는 이유: 동시에 두 작업이 같은 파일에 쓰지 않도록)
+                        if url in seen:
+                            continue
+                        if out_path in seen:
+                            # 다른 URL인데 이름이 같음 (같은 달·같은 과목 시험지가 둘 이상) → 먼저 나온 것만 받는다
+                            tqdm.write(f"※ 같은 파일명이 이미 있어 건너뜀: {title} -> {out_path.name} ({url})")
+                            continue
+                        seen.update((url, out_path))
+                        jobs.append((title, url, out_path))
+
+                # 이 페이지 파일들의 크기를 HEAD로 한꺼번에 확인하고 작은 것부터 큐에 넣는다:
+                # 큰 파일이 받아지는 동안 남는 연결에 작은 파일들이 채워진다.
+                # 이미 받아둔 파일도 HEAD 크기와 맞춰 보고, 같으면 건너뛴다
+                sizes = await asyncio.gather(*(head_size(client, url) for _, url, _ in jobs))
+                for size, job in sorted(zip(sizes, jobs), key=lambda sj: sj[0]):
+                    if is_complete(job[2], size):
+                        continue
+                    await queue.put((*job, size))
+
+                page += 1
+        finally:
+            # 중간에 실패/취소되면 미리 받던 다음 페이지 작업도 정리한다
+            # (그냥 두면 그 작업의 예외가 "never retrieved"로 따로 튀어나온다)
+            if next_page is not None:
+                next_page.cancel()
+                try:
+                    await next_page
+                except (asyncio.CancelledError, Exception):
+                    pass
+
+    done_files = 0  # 받기를 마친 파일 수 (진행바 옆에 표시)
+
+    async def consumer(client: httpx.AsyncClient, bar: tqdm):
+        nonlocal done_files
+        while (job := await queue.get()) is not None:
+            if await download_item(client, bar, *job):
+                # 이벤트 루프 하나에서만 돌아서 락 없이 세도 된다
+                done_files += 1
+                bar.set_postfix_str(f"{done_files}개 완료", refresh=False)
+
+    # 진행바는 전체에 하나만 둔다 (파일마다 만들면 동시 다운로드 시 출력이 병목).
+    # 터미널이 아닐 때(파이프/리다이렉트)는 아예 그리지 않는다
+    async with httpx.AsyncClient(http2=True, limits=limits, timeout=timeout, follow_redirects=True,
+                                 headers=dl_headers, cookies=cookies) as client:
+        with tqdm(total=None, unit="B", unit_scale=True, smoothing=0.05, mininterval=0.5,
+                  desc="다운로드", disable=not sys.stderr.isatty()) as bar:
+            # 목록 조회가 실패해도 이미 큐에 넣은 파일은 마저 받고, 끝난 뒤에 원래 예외를 그대로 올린다
+            # (TaskGroup 안에서 올리면 ExceptionGroup으로 감싸지고 받던 다운로드도 전부 취소된다).
+            # Ctrl+C(취소)는 Exception이 아니라서 여기서 잡지 않고 바로 멈춘다
+            list_error = None
+            async with asyncio.TaskGroup() as tg:
+                for _ in range(DOWNLOAD_CONCURRENCY):
+                    tg.create_task(consumer(client, bar))
+                try:
+                    await producer(client)
+                except Exception as e:
+                    list_error = e
+                for _ in range(DOWNLOAD_CONCURRENCY):
+                    await queue.put(None)
+            if list_error is not None:
+                raise list_error
+
 def main():
     ap = argparse.ArgumentParser(description="EBS Ajax 기반 페이지 순회 다운로드 (규칙형 이름 버전)")
     ap.add_argument("--list-url", default=DEFAULT_LIST_URL)
@@ -193,15 +507,32 @@ def main():
 
     target_cd = TARGET_MAP[args.grade]
 
-    session = requests.Session()
-    session.headers.update({
+    headers = {
         "User-Agent": "Mozilla/5.0 (compatible; EBS-Downloader/2.2)",
         "Origin": "https://www.ebsi.co.kr",
-        "Referer": "https://www.ebsi.co.kr/ebs/xip/xipc/previousPaperList.ebs?targetCd={target_cd}",
+        "Referer": f"https://www.ebsi.co.kr/ebs/xip/xipc/previousPaperList.ebs?targetCd={target_cd}",
         "X-Requested-With": "XMLHttpRequest",
         "Accept": "text/html, */*; q=0.01",
         "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
-    })
+    }
+
+    # 세션은 여기서 한 번만 만들고 목록 조회 전체에 재사용한다 (루프 안에서 새로 만들지 말 것)
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=32,
+        pool_block=False,
+        max_retries=Retry(
+            total=5,
+            backoff_factor=0.3,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=("GET", "POST"),
+        ),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(headers)
+    session.headers["Connection"] = "keep-alive"
 
     cookie_header = None
     if args.cookie_file and Path(args.cookie_file).exists():
@@ -214,83 +545,10 @@ def main():
     else:
         print("⚠️ cookie.txt 파일을 찾지 못했거나 비어 있음 → 로그인 필요한 자료는 다운로드 불가할 수 있습니다.")
 
-    out_root = Path(args.out)
-
-    grade_name = GRADE_NAME[args.grade]
-
-    # ✅ payload를 동적으로 구성 (subjList를 인자로부터)
-    payload_base = {
-        "beginYear": args.beginYear,
-        "endYear": args.endYear,
-        "targetCd": target_cd,
-        "monthList": args.monthList,
-        "subjList": str(args.category),  # ← 여기!
-        "sort": args.sort,
-        "pageSize": args.pageSize,
-    }
-
-    # 카테고리명(폴더명에 사용)
-    category_name = CATEGORY_MAP.get(args.category, f"카테고리{args.category}")
-
-    page = 1
-    while True:
-        data = list(payload_base.items()) + [("currentPage", str(page))]
-        r = session.post(args.list_url, data=data, timeout=60)
-        r.raise_for_status()
-        html = r.text
-
-        if args.debug:
-            Path(f"debug_page_{page}.html").write_text(html, encoding="utf-8", errors="ignore")
-
-        if "<li" not in html:
-            print(f"페이지 {page}: 더 이상 항목 없음 → 종료")
-            break
-
-        items = parse_list_items(html)
-        if not items:
-            print(f"페이지 {page}: 항목 없음 → 종료")
-            break
-
-        print(f"페이지 {page}: {len(items)}건 다운로드")
-
-        for title, prob_path, sol_path in items:
-            year  = extract_year(title)
-            month = extract_month(title)
-            subj_raw = extract_subject_raw(title)
-            subj_norm = normalize_subject(subj_raw)
-
-            prob_url = build_abs_url(prob_path, args.base) if prob_path else None
-            sol_url  = build_abs_url(sol_path,  args.base) if sol_path  else None
-
-            prob_ext = ext_from_url(prob_url, ".pdf")
-            sol_ext  = ext_from_url(sol_url,  ".pdf")
-
-            # ✅ 폴더명 규칙: downloads/기출문제_고3_{카테고리명}_{세부과목}_{년도}
-            # 예) 기출문제_고3_과학탐구_물리1_2021  /  기출문제_고3_영어_영어_2021
-            target_dir = out_root / f"기출문제_{grade_name}_{category_name}_{subj_norm}_{year}"
-
-            # 파일명 규칙: YYYY_MM_과목_문제 / YYYY_MM_과목_해설 (변경 없음)
-            base_prefix = f"{year}_{month}_{subj_norm}"
-            prob_name = f"{base_prefix}_문제{prob_ext}"
-            sol_name  = f"{base_prefix}_해설{sol_ext}"
-
-            try:
-                if prob_url:
-                    download_file(session, prob_url, target_dir / prob_name)
-                else:
-                    print(f"※ 문제 URL 없음: {title}")
-
-                if sol_url:
-                    download_file(session, sol_url, target_dir / sol_name)
-                else:
-                    print(f"※ 해설 URL 없음: {title}")
-
-            except requests.HTTPError as e:
-                print(f"HTTP 오류: {title} -> {e}")
-            except Exception as e:
-                print(f"다운로드 실패: {title} -> {e}")
-
-        page += 1
+    try:
+        asyncio.run(crawl(args, session, headers))
+    finally:
+        session.close()  # 풀에 남은 keep-alive 연결 정리
 
     print("✅ 전체 완료")
 